@@ -4,98 +4,272 @@ Convert Markdown presentation to PowerPoint format
 Improved version with better slide structure handling
 """
 
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+import copy
+import io
+import multiprocessing
+import os
 import re
 
-def parse_markdown(file_path):
-    """Parse markdown file and extract slides content"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Split by --- separator
-    sections = content.split('---')
+# Below this slide count the process spawn + merge overhead outweighs the
+# parallel rendering win, so small decks stay on the sequential path.
+_PARALLEL_MIN_SLIDES = 50
+
+# Presentation() re-reads and unzips the default template from disk on
+# every call; load the bytes once and build presentations from memory.
+with open(os.path.join(os.path.dirname(pptx.__file__),
+                       'templates', 'default.pptx'), 'rb') as _f:
+    _DEFAULT_TEMPLATE_BYTES = _f.read()
+
+# Length constants hoisted out of the per-slide hot path; Inches()/Pt()
+# construct a new Length object on every call.
+_IN_0_05 = Inches(0.05)
+_IN_0_1 = Inches(0.1)
+_IN_0_4 = Inches(0.4)
+_IN_0_5 = Inches(0.5)
+_IN_0_6 = Inches(0.6)
+_IN_0_7 = Inches(0.7)
+_IN_0_8 = Inches(0.8)
+_IN_0_9 = Inches(0.9)
+_IN_1 = Inches(1)
+_IN_1_2 = Inches(1.2)
+_IN_1_5 = Inches(1.5)
+_IN_1_6 = Inches(1.6)
+_IN_2 = Inches(2)
+_IN_2_5 = Inches(2.5)
+_IN_3 = Inches(3)
+_IN_3_2 = Inches(3.2)
+_IN_3_5 = Inches(3.5)
+_IN_4_5 = Inches(4.5)
+_IN_5_5 = Inches(5.5)
+_IN_7_5 = Inches(7.5)
+_IN_8 = Inches(8)
+_IN_9 = Inches(9)
+_IN_9_2 = Inches(9.2)
+_IN_10 = Inches(10)
+
+_PT_0 = Pt(0)
+_PT_4 = Pt(4)
+_PT_6 = Pt(6)
+_PT_8 = Pt(8)
+_PT_10 = Pt(10)
+_PT_11 = Pt(11)
+_PT_12 = Pt(12)
+_PT_14 = Pt(14)
+_PT_15 = Pt(15)
+_PT_18 = Pt(18)
+
+# Length subclasses int, so arithmetic on the constants above is plain
+# integer EMU math; derived code-block geometry is computed once here
+# rather than per slide.
+_CODE_BG_HEIGHT = _IN_2_5 + _IN_0_1
+
+# The deck only uses a handful of colors; build each RGBColor once instead
+# of per paragraph / table cell.
+_BLUE = RGBColor(30, 136, 229)        # #1E88E5
+_LIGHT_BLUE = RGBColor(66, 165, 245)  # #42A5F5
+_GRAY_TEXT = RGBColor(33, 33, 33)
+_BG_ALT = RGBColor(240, 248, 255)
+_WHITE = RGBColor(255, 255, 255)
+_CODE_BG = RGBColor(245, 245, 245)
+_CODE_BORDER = RGBColor(200, 200, 200)
+_CODE_FG = RGBColor(50, 50, 50)
+
+# Precompiled patterns for format_text (compile once, not per line)
+_BOLD_STAR = re.compile(r'\*\*(.*?)\*\*')
+_BOLD_UNDER = re.compile(r'__(.*?)__')
+
+# Prebuilt <p:sp> templates for the fixed-style single-paragraph boxes
+# (slide titles). Building the subtree via add_textbox plus a chain of
+# font setters walks the XML on every property write; deep-copying a
+# parsed template and patching id, geometry and text does it in one go.
+_SP_XML = (
+    '<p:sp xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    '<p:nvSpPr><p:cNvPr id="0" name=""/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="{wrap}"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+    '<a:p><a:pPr{algn}><a:defRPr sz="{sz}" b="1"><a:solidFill>'
+    '<a:srgbClr val="1E88E5"/></a:solidFill></a:defRPr></a:pPr>'
+    '<a:r><a:t/></a:r></a:p></p:txBody></p:sp>'
+)
+
+def _title_sp_template(sz, center=False, wrap='none'):
+    return parse_xml(_SP_XML.format(
+        wrap=wrap, algn=' algn="ctr"' if center else '', sz=sz))
+
+_CONTENT_TITLE_TMPL = _title_sp_template(3000)
+_SECTION_TITLE_TMPL = _title_sp_template(4400, center=True)
+_MAIN_TITLE_TMPL = _title_sp_template(4000, center=True, wrap='square')
+
+def _add_templated_textbox(slide, template, text, left, top, width, height):
+    """Deep-copy a prebuilt <p:sp>, patch id/geometry/text, and append it."""
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    sp = copy.deepcopy(template)
+
+    cNvPr = sp.find(qn('p:nvSpPr') + '/' + qn('p:cNvPr'))
+    cNvPr.set('id', str(shape_id))
+    cNvPr.set('name', 'TextBox %d' % (shape_id - 1))
+
+    xfrm = sp.find(qn('p:spPr') + '/' + qn('a:xfrm'))
+    off = xfrm.find(qn('a:off'))
+    off.set('x', str(left))
+    off.set('y', str(top))
+    ext = xfrm.find(qn('a:ext'))
+    ext.set('cx', str(width))
+    ext.set('cy', str(height))
+
+    sp.find('.//' + qn('a:t')).text = text
+    shapes._spTree.append(sp)
+
+def _new_slide_data():
+    return {'title': '', 'subtitles': [], 'content': [], 'table': None,
+            'code': [], 'kind': 'content'}
+
+def _finish_slide(slide_data, table_lines, slides, is_first):
+    """Attach parsed table rows, classify the slide, and append it if it
+    has anything.
+
+    Returns True if the slide was kept.
+    """
+    # Process table if exists
+    if table_lines:
+        table_data = []
+        for table_line in table_lines:
+            cells = [cell.strip() for cell in table_line.split('|')[1:-1]]
+            if cells:
+                table_data.append(cells)
+        if table_data:
+            # Pad ragged rows so the renderer can index cells directly
+            width = max(len(row) for row in table_data)
+            for row in table_data:
+                if len(row) < width:
+                    row.extend([''] * (width - len(row)))
+            slide_data['table'] = table_data
+
+    # Only add slide if it has content or title
+    if slide_data['title'] or slide_data['content'] or slide_data['table'] or slide_data['code']:
+        # Classify here, while the parser still has everything in hand,
+        # so the render loop doesn't re-scan titles per slide
+        title = slide_data['title']
+        if is_first:
+            slide_data['kind'] = 'title'
+        elif (title.startswith('第') and '部分' in title and
+              not slide_data['content'] and
+              not slide_data['table'] and
+              not slide_data['code']):
+            slide_data['kind'] = 'section'
+        # Truncate to what the renderer will actually show, so oversized
+        # lists don't survive past parsing
+        if slide_data['kind'] == 'content':
+            slide_data['code'] = slide_data['code'][:25]
+            if slide_data['table'] or slide_data['code']:
+                slide_data['content'] = slide_data['content'][:5]
+        slides.append(slide_data)
+        return True
+    return False
 
+def parse_markdown(file_path):
+    """Parse markdown file and extract slides content.
+
+    The file is streamed line by line; a bare '---' line (outside a code
+    block) ends the current slide. Sections are never materialized as a
+    list — each slide is flushed as its terminating separator is read —
+    so peak memory stays at one slide regardless of file size. This also
+    keeps table separator rows (|---|...) from being mistaken for slide
+    boundaries.
+    """
     slides = []
     title_slide_done = False
 
-    for section in sections:
-        if not section.strip():
-            continue
-
-        lines = section.strip().split('\n')
-        slide_data = {'title': '', 'subtitles': [], 'content': [], 'table': None, 'code': []}
-        in_code_block = False
-        code_lines = []
-        table_lines = []
+    # Bind the hot append methods once per list; inside the loop each
+    # slide_data['...'].append would cost a dict lookup plus an attribute
+    # lookup per line.
+    slide_data = _new_slide_data()
+    content_append = slide_data['content'].append
+    in_code_block = False
+    code_lines = []
+    code_append = code_lines.append
+    table_lines = []
+    table_append = table_lines.append
 
-        for line in lines:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
             line = line.rstrip('\n')
 
-            # Skip empty lines
-            if not line.strip():
-                if in_code_block:
-                    code_lines.append('')
-                continue
-
-            # Code block
-            if line.strip().startswith('```'):
-                if in_code_block:
+            # Code-block lines bypass the classifier entirely: only the
+            # closing fence matters, and raw lines keep their indentation.
+            if in_code_block:
+                if line.lstrip().startswith('```'):
                     # End code block
                     slide_data['code'] = code_lines
                     code_lines = []
+                    code_append = code_lines.append
                     in_code_block = False
                 else:
-                    # Start code block
-                    in_code_block = True
+                    code_append(line)
                 continue
 
-            if in_code_block:
-                code_lines.append(line)
-                continue
+            # Strip once per line and reuse; each .strip() allocates a new string
+            s = line.strip()
 
-            # Table
-            if line.strip().startswith('|'):
-                table_lines.append(line)
+            # Skip empty lines
+            if not s:
                 continue
 
-            # Main title (# Title) - only for title slide
-            if line.startswith('# ') and not line.startswith('##'):
-                if not title_slide_done:
-                    slide_data['title'] = line[2:].strip()
+            # Slide separator
+            if s == '---':
+                if _finish_slide(slide_data, table_lines, slides,
+                                 not title_slide_done):
+                    title_slide_done = True
+                slide_data = _new_slide_data()
+                content_append = slide_data['content'].append
+                table_lines = []
+                table_append = table_lines.append
                 continue
 
-            # Section title (## Title) or Slide title
-            if line.startswith('## '):
-                slide_data['title'] = line[3:].strip()
+            # Dispatch on the first character; most lines are plain content
+            head = s[0]
+            if head == '#':
+                # Subtitle (### Title)
+                if s.startswith('### '):
+                    slide_data['subtitles'].append(s[4:].strip())
+                    continue
+                # Section title (## Title) or Slide title
+                if s.startswith('## '):
+                    slide_data['title'] = s[3:].strip()
+                    continue
+                # Main title (# Title) - only for title slide
+                if s.startswith('# '):
+                    if not title_slide_done:
+                        slide_data['title'] = s[2:].strip()
+                    continue
+            elif head == '|':
+                # Table; the separator row (|---|, |:---, space-padded
+                # | --- |) starts with '-' or ':' after the pipe and any
+                # padding, so drop it here instead of rescanning every
+                # row at flush time
+                if s.lstrip('| \t')[:1] not in ('-', ':'):
+                    table_append(line)
                 continue
-
-            # Subtitle (### Title)
-            if line.startswith('### '):
-                slide_data['subtitles'].append(line[4:].strip())
+            elif head == '`' and s.startswith('```'):
+                # Start code block
+                in_code_block = True
                 continue
 
             # Regular content
-            slide_data['content'].append(line.strip())
-
-        # Process table if exists
-        if table_lines:
-            table_data = []
-            for table_line in table_lines:
-                if '---' not in table_line:  # Skip separator line
-                    cells = [cell.strip() for cell in table_line.split('|')[1:-1]]
-                    if cells:
-                        table_data.append(cells)
-            if table_data:
-                slide_data['table'] = table_data
-
-        # Only add slide if it has content or title
-        if slide_data['title'] or slide_data['content'] or slide_data['table'] or slide_data['code']:
-            if not title_slide_done:
-                title_slide_done = True
-            slides.append(slide_data)
+            content_append(s)
+
+    # Flush the last slide
+    _finish_slide(slide_data, table_lines, slides, not title_slide_done)
 
     return slides
 
@@ -105,47 +279,34 @@ def add_title_slide(prs, title, content_lines):
     slide = prs.slides.add_slide(slide_layout)
 
     # Main title
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2.0), Inches(9), Inches(1.2))
-    title_frame = title_box.text_frame
-    title_frame.text = title
-    title_frame.word_wrap = True
-
-    title_para = title_frame.paragraphs[0]
-    title_para.alignment = PP_ALIGN.CENTER
-    title_para.font.size = Pt(40)
-    title_para.font.bold = True
-    title_para.font.color.rgb = RGBColor(30, 136, 229)  # #1E88E5
+    _add_templated_textbox(slide, _MAIN_TITLE_TMPL, title,
+                           _IN_0_5, _IN_2, _IN_9, _IN_1_2)
 
     # Subtitle info
     if content_lines:
-        subtitle_box = slide.shapes.add_textbox(Inches(1), Inches(3.5), Inches(8), Inches(2))
+        subtitle_box = slide.shapes.add_textbox(_IN_1, _IN_3_5, _IN_8, _IN_2)
         subtitle_frame = subtitle_box.text_frame
         subtitle_frame.word_wrap = True
 
-        for i, line in enumerate(content_lines):
-            if i > 0:
-                subtitle_frame.add_paragraph()
-            p = subtitle_frame.paragraphs[i]
+        # paragraphs[i] re-walks the XML children on each access; hold the
+        # paragraph returned by add_paragraph() instead
+        first = True
+        for line in content_lines:
+            p = subtitle_frame.paragraphs[0] if first else subtitle_frame.add_paragraph()
+            first = False
             p.text = line
             p.alignment = PP_ALIGN.CENTER
-            p.font.size = Pt(18)
-            p.font.color.rgb = RGBColor(66, 165, 245)  # #42A5F5
-            p.space_after = Pt(6)
+            p.font.size = _PT_18
+            p.font.color.rgb = _LIGHT_BLUE
+            p.space_after = _PT_6
 
 def add_section_slide(prs, title):
     """Add section separator slide"""
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
 
-    title_box = slide.shapes.add_textbox(Inches(1), Inches(3), Inches(8), Inches(1.5))
-    title_frame = title_box.text_frame
-    title_frame.text = title
-
-    title_para = title_frame.paragraphs[0]
-    title_para.alignment = PP_ALIGN.CENTER
-    title_para.font.size = Pt(44)
-    title_para.font.bold = True
-    title_para.font.color.rgb = RGBColor(30, 136, 229)
+    _add_templated_textbox(slide, _SECTION_TITLE_TMPL, title,
+                           _IN_1, _IN_3, _IN_8, _IN_1_5)
 
 def add_content_slide(prs, slide_data):
     """Add content slide with title, content, table, and code"""
@@ -159,159 +320,218 @@ def add_content_slide(prs, slide_data):
     code = slide_data['code']
 
     # Calculate vertical positioning
-    top_pos = Inches(0.5)
+    top_pos = _IN_0_5
 
     # Title
     if title:
-        title_box = slide.shapes.add_textbox(Inches(0.5), top_pos, Inches(9), Inches(0.8))
-        title_frame = title_box.text_frame
-        title_frame.text = title
-
-        title_para = title_frame.paragraphs[0]
-        title_para.font.size = Pt(30)
-        title_para.font.bold = True
-        title_para.font.color.rgb = RGBColor(30, 136, 229)
+        _add_templated_textbox(slide, _CONTENT_TITLE_TMPL, title,
+                               _IN_0_5, top_pos, _IN_9, _IN_0_8)
 
-        top_pos += Inches(0.9)
+        top_pos += _IN_0_9
 
     # Subtitles
     if subtitles:
-        subtitle_box = slide.shapes.add_textbox(Inches(0.5), top_pos, Inches(9), Inches(0.6))
+        subtitle_box = slide.shapes.add_textbox(_IN_0_5, top_pos, _IN_9, _IN_0_6)
         subtitle_frame = subtitle_box.text_frame
         subtitle_frame.word_wrap = True
 
-        for i, subtitle in enumerate(subtitles):
-            if i > 0:
-                subtitle_frame.add_paragraph()
-
-            p = subtitle_frame.paragraphs[i]
+        first = True
+        for subtitle in subtitles:
+            p = subtitle_frame.paragraphs[0] if first else subtitle_frame.add_paragraph()
+            first = False
             p.text = subtitle
-            p.font.size = Pt(18)
+            p.font.size = _PT_18
             p.font.bold = True
-            p.font.color.rgb = RGBColor(66, 165, 245)
-            p.space_after = Pt(4)
+            p.font.color.rgb = _LIGHT_BLUE
+            p.space_after = _PT_4
 
-        top_pos += Inches(0.7)
+        top_pos += _IN_0_7
 
     # Content
     has_table_or_code = bool(table or code)
-    content_height = Inches(2.5) if has_table_or_code else Inches(5.5)
+    content_height = _IN_2_5 if has_table_or_code else _IN_5_5
 
     if content and not has_table_or_code:
-        content_box = slide.shapes.add_textbox(Inches(0.5), top_pos, Inches(9), content_height)
+        content_box = slide.shapes.add_textbox(_IN_0_5, top_pos, _IN_9, content_height)
         text_frame = content_box.text_frame
         text_frame.word_wrap = True
 
-        for i, text in enumerate(content):
-            if i > 0:
-                text_frame.add_paragraph()
-
-            p = text_frame.paragraphs[i]
+        first = True
+        for text in content:
+            p = text_frame.paragraphs[0] if first else text_frame.add_paragraph()
+            first = False
             p.text = format_text(text)
-            p.font.size = Pt(15)
-            p.font.color.rgb = RGBColor(33, 33, 33)
-            p.space_after = Pt(8)
+            p.font.size = _PT_15
+            p.font.color.rgb = _GRAY_TEXT
+            p.space_after = _PT_8
             p.line_spacing = 1.4
 
         top_pos += content_height
     elif content:
         # Short content when there's table/code
-        content_box = slide.shapes.add_textbox(Inches(0.5), top_pos, Inches(9), Inches(1.5))
+        content_box = slide.shapes.add_textbox(_IN_0_5, top_pos, _IN_9, _IN_1_5)
         text_frame = content_box.text_frame
         text_frame.word_wrap = True
 
-        for i, text in enumerate(content[:5]):  # Limit to 5 lines
-            if i > 0:
-                text_frame.add_paragraph()
-
-            p = text_frame.paragraphs[i]
+        first = True
+        for text in content:  # Already trimmed to 5 lines
+            p = text_frame.paragraphs[0] if first else text_frame.add_paragraph()
+            first = False
             p.text = format_text(text)
-            p.font.size = Pt(14)
-            p.font.color.rgb = RGBColor(33, 33, 33)
-            p.space_after = Pt(6)
+            p.font.size = _PT_14
+            p.font.color.rgb = _GRAY_TEXT
+            p.space_after = _PT_6
 
-        top_pos += Inches(1.6)
+        top_pos += _IN_1_6
 
     # Table
     if table and len(table) > 0:
         rows = min(len(table), 10)  # Limit to 10 rows
         cols = len(table[0])
 
-        table_left = Inches(0.5)
+        table_left = _IN_0_5
         table_top = top_pos
-        table_width = Inches(9)
-        table_height = Inches(3)
+        table_width = _IN_9
+        table_height = _IN_3
 
         shape = slide.shapes.add_table(rows, cols, table_left, table_top, table_width, table_height)
         tbl = shape.table
 
-        # Adjust column widths
+        # Adjust column widths (integer EMU division, no float roundtrip)
+        col_width = table_width // cols
         for col in range(cols):
-            tbl.columns[col].width = Inches(table_width.inches / cols)
-
-        for r in range(rows):
+            tbl.columns[col].width = col_width
+
+        # Hoist per-table invariants out of the cell loop; every attribute
+        # chain on a python-pptx object re-walks the underlying XML.
+        cell_fn = tbl.cell
+        font_size = _PT_11 if rows > 8 else _PT_12
+
+        # Header row
+        header = table[0]
+        for c in range(cols):
+            cell = cell_fn(0, c)
+            tf = cell.text_frame
+            tf.text = header[c]
+
+            para = tf.paragraphs[0]
+            para.font.size = font_size
+            para.alignment = PP_ALIGN.CENTER
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = _BLUE
+            para.font.bold = True
+            para.font.color.rgb = _WHITE
+
+        # Body rows: the alternating fill depends only on the row index
+        for r in range(1, rows):
+            row = table[r]
+            is_alt = (r % 2 == 0)
             for c in range(cols):
-                cell = tbl.cell(r, c)
-                cell.text = str(table[r][c]) if r < len(table) and c < len(table[r]) else ''
+                cell = cell_fn(r, c)
+                tf = cell.text_frame
+                tf.text = row[c]
 
-                para = cell.text_frame.paragraphs[0]
-                para.font.size = Pt(11 if rows > 8 else 12)
+                para = tf.paragraphs[0]
+                para.font.size = font_size
                 para.alignment = PP_ALIGN.CENTER
-
-                # Header row
-                if r == 0:
-                    cell.fill.solid()
-                    cell.fill.fore_color.rgb = RGBColor(30, 136, 229)
-                    para.font.bold = True
-                    para.font.color.rgb = RGBColor(255, 255, 255)
-                # Alternate rows
-                elif r % 2 == 0:
+                if is_alt:
                     cell.fill.solid()
-                    cell.fill.fore_color.rgb = RGBColor(240, 248, 255)
+                    cell.fill.fore_color.rgb = _BG_ALT
 
-        top_pos += Inches(3.2)
+        top_pos += _IN_3_2
 
     # Code block
     if code:
-        code_top = top_pos if not table else Inches(4.5)
-        code_height = Inches(2.5)
+        code_top = top_pos if not table else _IN_4_5
+        code_height = _IN_2_5
 
         # Background
         background = slide.shapes.add_shape(
             1,  # Rectangle
-            Inches(0.4), code_top - Inches(0.05),
-            Inches(9.2), code_height + Inches(0.1)
+            _IN_0_4, code_top - _IN_0_05,
+            _IN_9_2, _CODE_BG_HEIGHT
         )
         background.fill.solid()
-        background.fill.fore_color.rgb = RGBColor(245, 245, 245)
-        background.line.color.rgb = RGBColor(200, 200, 200)
+        background.fill.fore_color.rgb = _CODE_BG
+        background.line.color.rgb = _CODE_BORDER
 
-        code_box = slide.shapes.add_textbox(Inches(0.5), code_top, Inches(9), code_height)
+        code_box = slide.shapes.add_textbox(_IN_0_5, code_top, _IN_9, code_height)
         code_frame = code_box.text_frame
         code_frame.word_wrap = True
 
         # Join code lines
-        code_text = '\n'.join(code[:25])  # Limit to 25 lines
+        code_text = '\n'.join(code)  # Already trimmed to 25 lines
         code_frame.text = code_text
 
-        for paragraph in code_frame.paragraphs:
-            paragraph.font.name = 'Consolas'
-            paragraph.font.size = Pt(10)
-            paragraph.font.color.rgb = RGBColor(50, 50, 50)
-            paragraph.space_after = Pt(0)
+        # Style the first paragraph through the API, then clone its <a:pPr>
+        # into the remaining paragraphs; repeating the setter chain per
+        # paragraph re-walks the XML tree for every property write.
+        paragraphs = code_frame.paragraphs
+        first = paragraphs[0]
+        first.font.name = 'Consolas'
+        first.font.size = _PT_10
+        first.font.color.rgb = _CODE_FG
+        first.space_after = _PT_0
+
+        pPr = first._p.find(qn('a:pPr'))
+        for paragraph in paragraphs[1:]:
+            paragraph._p.insert(0, copy.deepcopy(pPr))
 
 def format_text(text):
     """Format markdown text with basic formatting"""
     # Remove markdown bold markers for now (keep text)
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'__(.*?)__', r'\1', text)
+    text = _BOLD_STAR.sub(r'\1', text)
+    text = _BOLD_UNDER.sub(r'\1', text)
 
-    # Handle checkboxes
-    text = re.sub(r'- \[x\]', '✅', text)
-    text = re.sub(r'- \[ \]', '⬜', text)
+    # Handle checkboxes (literal patterns: str.replace avoids the regex engine)
+    text = text.replace('- [x]', '✅').replace('- [ ]', '⬜')
 
     return text
 
+# Slides carry their 'kind' from the parser; dispatch straight to the
+# matching renderer instead of re-testing titles in the slide loop.
+_SLIDE_RENDERERS = {
+    'title': lambda prs, sd: add_title_slide(prs, sd['title'], sd['content']),
+    'section': lambda prs, sd: add_section_slide(prs, sd['title']),
+    'content': add_content_slide,
+}
+
+def _new_presentation():
+    """Create an empty presentation with the deck's slide size."""
+    prs = Presentation(io.BytesIO(_DEFAULT_TEMPLATE_BYTES))
+    prs.slide_width = _IN_10
+    prs.slide_height = _IN_7_5
+    return prs
+
+def _render_slide(prs, slide_data):
+    _SLIDE_RENDERERS[slide_data['kind']](prs, slide_data)
+
+def _render_chunk(chunk):
+    """Worker: render a list of slide_data dicts to pptx bytes."""
+    prs = _new_presentation()
+    for slide_data in chunk:
+        _render_slide(prs, slide_data)
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+def _merge_rendered(prs, blob):
+    """Append every slide from a worker-rendered blob onto prs.
+
+    The slides only contain textboxes, tables and plain shapes (no
+    external relationships), so copying each slide's shape tree into a
+    fresh blank slide is enough to reproduce it.
+    """
+    src = Presentation(io.BytesIO(blob))
+    blank_layout = prs.slide_layouts[6]
+    skip_tags = (qn('p:nvGrpSpPr'), qn('p:grpSpPr'))
+
+    for src_slide in src.slides:
+        dst_tree = prs.slides.add_slide(blank_layout).shapes._spTree
+        for child in src_slide.shapes._spTree:
+            if child.tag not in skip_tags:
+                dst_tree.append(copy.deepcopy(child))
+
 def create_presentation(md_file, output_file):
     """Create PowerPoint presentation from markdown"""
     print("📖 Parsing markdown file...")
@@ -320,31 +540,28 @@ def create_presentation(md_file, output_file):
     print(f"📊 Found {len(slides_data)} slides")
     print("🎨 Creating PowerPoint presentation...")
 
-    # Create presentation
-    prs = Presentation()
-    prs.slide_width = Inches(10)
-    prs.slide_height = Inches(7.5)
-
-    # Process slides
-    for i, slide_data in enumerate(slides_data, 1):
-        title = slide_data['title']
-
-        # Check if it's a section slide (has # in title and little content)
-        is_section = (title.startswith('第') and '部分' in title and
-                      not slide_data['content'] and
-                      not slide_data['table'] and
-                      not slide_data['code'])
-
-        # First slide is title slide
-        if i == 1:
-            add_title_slide(prs, title, slide_data['content'])
-        elif is_section:
-            add_section_slide(prs, title)
-        else:
-            add_content_slide(prs, slide_data)
-
-        if i % 10 == 0:
-            print(f"  Processed {i}/{len(slides_data)} slides...")
+    jobs = slides_data
+    workers = os.cpu_count() or 1
+    if len(jobs) >= _PARALLEL_MIN_SLIDES and workers > 1:
+        # python-pptx is CPU-bound on lxml mutations; render chunks in
+        # worker processes and merge the resulting slide XML in order.
+        chunk_size = (len(jobs) + workers - 1) // workers
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        print(f"  Rendering {len(chunks)} chunks on {workers} cores...")
+
+        with multiprocessing.Pool(len(chunks)) as pool:
+            blobs = pool.map(_render_chunk, chunks)
+
+        prs = _new_presentation()
+        for blob in blobs:
+            _merge_rendered(prs, blob)
+    else:
+        prs = _new_presentation()
+        for i, slide_data in enumerate(jobs, 1):
+            _render_slide(prs, slide_data)
+
+            if i % 10 == 0:
+                print(f"  Processed {i}/{len(slides_data)} slides...")
 
     # Save
     prs.save(output_file)